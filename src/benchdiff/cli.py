@@ -7,25 +7,18 @@ Command-line interface wiring for BenchDiff.
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import json
 import re
 import sys
 from typing import Dict, Optional
 
-from .color_utils import should_enable_color
 from .compare import (
     DEFAULT_THRESHOLDS,
-    extract_benchmarks,
-    load_json,
+    load_benchmark_map,
     evaluate_ci_gate,
     compare_maps,
 )
-from .report import (
-    print_quick_summary,
-    print_aggregated_top,
-    print_aggregated_full,
-    print_top_entries,
-)
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -102,6 +95,16 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
 def run(argv: Optional[list[str]] = None) -> int:
     args = parse_args(argv)
 
+    # Deferred so that --help and argument errors never pay the rendering
+    # modules' import cost.
+    from .color_utils import should_enable_color
+    from .report import (
+        print_quick_summary,
+        print_aggregated_top,
+        print_aggregated_full,
+        print_top_entries,
+    )
+
     thresholds: Dict[str, float] = DEFAULT_THRESHOLDS.copy()
     if args.thresholds:
         try:
@@ -113,9 +116,17 @@ def run(argv: Optional[list[str]] = None) -> int:
 
     color_enabled = should_enable_color(no_color_flag=args.no_color, stream=sys.stdout)
 
-    def _load_input_json(path: str, label: str):
+    name_filter = None
+    if args.benchmark_filter:
+        try:
+            name_filter = re.compile(args.benchmark_filter)
+        except re.error as e:
+            print(f"Invalid --benchmark-filter regex: {e}", file=sys.stderr)
+            return 2
+
+    def _resolve_input_map(future, path: str, label: str):
         try:
-            return load_json(path)
+            return future.result()
         except FileNotFoundError:
             print(f"{label} file not found: {path}", file=sys.stderr)
             print(
@@ -130,24 +141,15 @@ def run(argv: Optional[list[str]] = None) -> int:
             print(f"Failed to read {label} at {path}: {e}", file=sys.stderr)
             return None
 
-    ref_json = _load_input_json(args.ref, "Reference")
-    if ref_json is None:
+    # The two inputs are independent; loading them in two threads overlaps
+    # the read of one with the parse of the other (orjson releases the GIL).
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        fut_ref = executor.submit(load_benchmark_map, args.ref, name_filter, args.metric)
+        fut_cur = executor.submit(load_benchmark_map, args.cur, name_filter, args.metric)
+        ref_map = _resolve_input_map(fut_ref, args.ref, "Reference")
+        cur_map = _resolve_input_map(fut_cur, args.cur, "Current")
+    if ref_map is None or cur_map is None:
         return 2
-    cur_json = _load_input_json(args.cur, "Current")
-    if cur_json is None:
-        return 2
-
-    ref_map = extract_benchmarks(ref_json)
-    cur_map = extract_benchmarks(cur_json)
-
-    if args.benchmark_filter:
-        try:
-            pattern = re.compile(args.benchmark_filter)
-        except re.error as e:
-            print(f"Invalid --benchmark-filter regex: {e}", file=sys.stderr)
-            return 2
-        ref_map = {name: b for name, b in ref_map.items() if pattern.search(name)}
-        cur_map = {name: b for name, b in cur_map.items() if pattern.search(name)}
 
     comparisons = compare_maps(ref_map, cur_map, args.metric, thresholds)
 
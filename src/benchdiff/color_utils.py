@@ -15,7 +15,9 @@ from __future__ import annotations
 import os
 import re
 import sys
-from typing import Dict, Optional
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Union
 
 
 # Regex to strip ANSI sequences
@@ -43,53 +45,146 @@ def should_enable_color(no_color_flag: bool = False, stream = sys.stdout) -> boo
 
 
 def strip_ansi(text: str) -> str:
+    # Plain strings (the no-color case) skip the regex engine entirely.
+    if "\x1b" not in text:
+        return text
     return ANSI_RE.sub("", text)
 
 
-def ansi(color_code: str, text: str, *, enabled: bool = True) -> str:
+def _visible_len(text: str) -> int:
+    """Visible length of a possibly ANSI-colored string.
+
+    Counts characters outside escape sequences without materializing a
+    stripped copy; plain strings cost a single containment check.
+    """
+    if "\x1b" not in text:
+        return len(text)
+    n = 0
+    i = 0
+    length = len(text)
+    while i < length:
+        if text[i] == "\x1b":
+            j = text.find("m", i)
+            i = length if j < 0 else j + 1
+        else:
+            n += 1
+            i += 1
+    return n
+
+
+# Prebuilt template: %-substitution skips f-string formatting machinery
+# on the per-cell hot path.
+_ANSI_TMPL = "\x1b[%sm%s\x1b[0m"
+
+
+class ColoredCell(NamedTuple):
+    """A colored string carrying its visible (escape-free) length.
+
+    Colorizers know the payload length at construction time, so padding
+    never has to re-scan for escape sequences. Prints like a plain str.
+    """
+
+    text: str
+    vlen: int
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def ansi(color_code: str, text: str, *, enabled: bool = True) -> ColoredCell:
     """Applies ANSI code if enabled=True, otherwise returns plain text."""
-    return text if not enabled else f"\033[{color_code}m{text}\033[0m"
+    wrapped = _ANSI_TMPL % (color_code, text) if enabled else text
+    return ColoredCell(wrapped, len(text))
+
+
+@lru_cache(maxsize=256)
+def _ansi_cached(color_code: str, text: str) -> ColoredCell:
+    """ansi() for labels drawn from small closed sets (directions, severities)."""
+    return ColoredCell(_ANSI_TMPL % (color_code, text), len(text))
 
 
-def pad_ansi(colored_text: str, width: int, *, align: str = "right") -> str:
+def pad_ansi(
+    colored_text: Union[str, ColoredCell], width: int, *, align: str = "right"
+) -> str:
     """Pads a potentially ANSI-colored string to a fixed width (align left/right)."""
-    visible_len = len(strip_ansi(colored_text))
-    pad = max(0, width - visible_len)
-    return colored_text + (" " * pad) if align == "left" else (" " * pad) + colored_text
+    if isinstance(colored_text, ColoredCell):
+        text, vlen = colored_text
+    else:
+        text, vlen = colored_text, _visible_len(colored_text)
+    pad = max(0, width - vlen)
+    return text + (" " * pad) if align == "left" else (" " * pad) + text
+
+
+_SEVERITY_LABELS = ("minor", "moderate", "major")
+
+
+@lru_cache(maxsize=4096)
+def _classify_severity_cached(magnitude_pct: float, moderate: float, major: float) -> str:
+    return _SEVERITY_LABELS[bisect_right((moderate, major), magnitude_pct)]
 
 
 def classify_severity(magnitude_pct: float, thresholds: Dict[str, float]) -> str:
     """Classifies regression severity based on a positive percentage."""
-    return (
-        "major" if magnitude_pct >= thresholds["major_pct"]
-        else "moderate" if magnitude_pct >= thresholds["moderate_pct"]
-        else "minor"
+    return _classify_severity_cached(
+        magnitude_pct, thresholds["moderate_pct"], thresholds["major_pct"]
     )
 
 
+@lru_cache(maxsize=32)
 def _severity_color(direction: str, severity: str) -> str:
     mapping = SEVERITY_COLOR.get(direction, {})
     return mapping.get(severity, NEUTRAL_COLOR)
 
 
-def colorize_direction(direction: str, severity: str, *, enabled: bool = True) -> str:
+def colorize_direction(
+    direction: str, severity: str, *, enabled: bool = True
+) -> Union[str, ColoredCell]:
     """Colorizes the direction label: regression/improvement/unchanged/unknown."""
+    if not enabled:
+        return direction
     if direction in {"regression", "improvement"}:
         sev = severity if (direction == "regression" or severity in {"minor", "moderate", "major"}) else "minor"
-        return ansi(_severity_color(direction, sev), direction, enabled=enabled)
-    return ansi(NEUTRAL_COLOR, direction, enabled=enabled)
+        code = _severity_color(direction, sev)
+    else:
+        code = NEUTRAL_COLOR
+    return _ansi_cached(code, direction)
 
 
-def colorize_severity_label(severity: str, direction: str, *, enabled: bool = True) -> str:
+def colorize_severity_label(
+    severity: str, direction: str, *, enabled: bool = True
+) -> Union[str, ColoredCell]:
     """Colorizes the severity label according to the direction."""
-    return (
-        ansi(NEUTRAL_COLOR, severity, enabled=enabled)
+    if not enabled:
+        return severity
+    code = (
+        NEUTRAL_COLOR
         if severity not in {"minor", "moderate", "major"}
-        else ansi(_severity_color(direction, severity), severity, enabled=enabled)
+        else _severity_color(direction, severity)
     )
+    return _ansi_cached(code, severity)
 
 
-def colorize_rel_change(value: Optional[float], *, thresholds: Dict[str, float], enabled: bool = True) -> str:
+@lru_cache(maxsize=2048)
+def _colorize_rel_change_cached(
+    value: float, minor: float, moderate: float, major: float
+) -> ColoredCell:
+    text = f"{value*100:+.2f}%"
+    mag_pct = abs(value) * 100.0
+    if mag_pct < minor:
+        return ColoredCell(_ANSI_TMPL % (NEUTRAL_CHANGE_COLOR, text), len(text))
+    sev = _SEVERITY_LABELS[bisect_right((moderate, major), mag_pct)]
+    if value > 0:
+        code = _severity_color("regression", sev)
+    elif value < 0:
+        code = _severity_color("improvement", sev)
+    else:
+        code = NEUTRAL_CHANGE_COLOR
+    return ColoredCell(_ANSI_TMPL % (code, text), len(text))
+
+
+def colorize_rel_change(
+    value: Optional[float], *, thresholds: Dict[str, float], enabled: bool = True
+) -> Union[str, ColoredCell]:
     """Colorizes a relative change (e.g., +0.123 -> +12.3%) with symmetric palette.
 
     Convention (time-like metrics):
@@ -97,28 +192,28 @@ def colorize_rel_change(value: Optional[float], *, thresholds: Dict[str, float],
     - value < 0: improvement (green code based on severity)
     - |value| < minor_pct: neutral color (cyan)
     - value == 0: neutral color (cyan)
+
+    Values repeat across sections (the aggregated tables render the same
+    kernels twice), so the colored cell is cached per (value, thresholds).
     """
     if value is None:
         return "NA"
-    mag_pct = abs(value) * 100.0
-    if mag_pct < thresholds["minor_pct"]:
-        return ansi(NEUTRAL_CHANGE_COLOR, f"{value*100:+.2f}%", enabled=enabled)
-    sev = classify_severity(mag_pct, thresholds)
-    if value > 0:
-        code = _severity_color("regression", sev)
-    elif value < 0:
-        code = _severity_color("improvement", sev)
-    else:
-        code = NEUTRAL_CHANGE_COLOR
-    return ansi(code, f"{value*100:+.2f}%", enabled=enabled)
+    if not enabled:
+        return f"{value*100:+.2f}%"
+    return _colorize_rel_change_cached(
+        value, thresholds["minor_pct"], thresholds["moderate_pct"], thresholds["major_pct"]
+    )
 
 
 def fit_text(text: Optional[str], width: int) -> str:
     """Truncates/extends text to fixed width (without color)."""
     if text is None:
-        return "".ljust(width)
-    if len(text) <= width:
-        return text.ljust(width)
+        return " " * width
+    n = len(text)
+    if n == width:
+        return text
+    if n < width:
+        return text + " " * (width - n)
     if width <= 3:
         return text[:width]
     return text[: width - 3] + "..."
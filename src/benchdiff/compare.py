@@ -6,14 +6,39 @@ Core comparison logic and data structures for BenchDiff.
 
 from __future__ import annotations
 
+import functools
 import json
 import math
-import statistics
+import operator
+import os
+import re
+import sys
+from collections import defaultdict
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple
 
 from .color_utils import classify_severity
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speedup
+    np = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional speedup
+    numba = None
+
 
 DEFAULT_THRESHOLDS: Dict[str, float] = {
     "minor_pct": 2.0,
@@ -23,8 +48,16 @@ DEFAULT_THRESHOLDS: Dict[str, float] = {
 
 THROUGHPUT_METRICS = {"bytes_per_second", "items_per_second"}
 
+# Sign applied to pct change so that positive always means regression
+# (-1 for higher-is-better throughput metrics); avoids a set lookup per call.
+_SIGN: Dict[str, int] = {m: -1 for m in THROUGHPUT_METRICS}
 
-@dataclass
+# Inputs at or above this size (bytes) are stream-parsed entry by entry
+# instead of materializing the whole JSON tree.
+STREAM_SIZE_THRESHOLD = 50 * 1024 * 1024
+
+
+@dataclass(slots=True, frozen=True)
 class BenchEntry:
     name: str
     metric: str
@@ -33,7 +66,18 @@ class BenchEntry:
     extra: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class Aggregate:
+    kernel: str
+    count: int
+    mean_relative_change: float
+    min_relative_change: float
+    max_relative_change: float
+    aggregated_direction: str
+    aggregated_severity: str
+
+
+@dataclass(slots=True, frozen=True)
 class Comparison:
     name: str
     metric: str
@@ -45,14 +89,41 @@ class Comparison:
     time_unit: Optional[str]
     notes: Optional[str]
     relative_change: Optional[float] = None
+    # Derived once at construction so downstream sign logic never re-tests
+    # metric membership in THROUGHPUT_METRICS.
+    is_throughput: bool = False
+    # Magnitudes precomputed at construction; sorting and CI gating read
+    # them repeatedly and never re-branch on direction/metric.
+    regression_magnitude_pct: float = 0.0
+    improvement_magnitude_pct: float = 0.0
+    # Kernel portion of the name, split once at construction so the
+    # aggregation pass never repeats the string work per entry.
+    kernel_key: str = ""
 
 
 def load_json(path: str) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load a benchmark JSON file, preferring orjson when available.
+
+    Google Benchmark outputs can reach several MB; orjson parses them ~4-5x
+    faster than stdlib json. Set BENCHDIFF_JSON=stdlib to force stdlib json.
+    """
+    backend = os.environ.get("BENCHDIFF_JSON", "orjson")
+    # Read raw bytes in one shot: both orjson and stdlib json parse bytes
+    # directly, so there is no need for Python's text-mode decode pass.
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None and backend != "stdlib":
+        return orjson.loads(data)
+    return json.loads(data)
+
 
+def _bench_name(b: Dict[str, Any]) -> Optional[str]:
+    return b.get("name") or b.get("benchmark") or b.get("bench")
 
-def extract_benchmarks(json_obj: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+
+def extract_benchmarks(
+    json_obj: Dict[str, Any], name_filter: Optional[re.Pattern] = None
+) -> Dict[str, Dict[str, Any]]:
     arr = (
         json_obj.get("benchmarks")
         if isinstance(json_obj, dict) and isinstance(json_obj.get("benchmarks"), list)
@@ -61,25 +132,92 @@ def extract_benchmarks(json_obj: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     if arr is None:
         raise ValueError("Input JSON doesn't contain 'benchmarks' list. Provide the JSON produced by Google Benchmark.")
 
-    def _name(b: Dict[str, Any]) -> Optional[str]:
-        return b.get("name") or b.get("benchmark") or b.get("bench")
+    # Names are interned: the same strings are hashed and compared many
+    # times afterwards (map joins, grouping, sorting), and ref/cur share
+    # almost all of them.
+    if name_filter is None:
+        return {sys.intern(n): b for b in arr if (n := _bench_name(b))}
+    return {sys.intern(n): b for b in arr if (n := _bench_name(b)) and name_filter.search(n)}
+
+
+# Fields choose_metric_for_benchmark may read; streamed entries are
+# projected onto these so verbose per-run stats never stay resident.
+_PROJECTED_FIELDS = (
+    "name",
+    "time_unit",
+    "real_time",
+    "cpu_time",
+    "bytes_per_second",
+    "items_per_second",
+    "primary_metric",
+    "primary",
+)
+
+
+def _stream_extract(
+    path: str,
+    name_filter: Optional[re.Pattern] = None,
+    metric_preference: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Build the name->benchmark map incrementally with ijson.
+
+    Peak memory stays bounded to one entry instead of the whole JSON
+    tree, and each kept entry is projected onto the fields the metric
+    chooser consumes (plus a user-preferred metric, if any).
+    """
+    fields = _PROJECTED_FIELDS
+    if metric_preference is not None and metric_preference not in fields:
+        fields = fields + (metric_preference,)
+    out: Dict[str, Dict[str, Any]] = {}
+    with open(path, "rb") as f:
+        for b in ijson.items(f, "benchmarks.item"):
+            n = _bench_name(b)
+            if not n or (name_filter is not None and not name_filter.search(n)):
+                continue
+            out[sys.intern(n)] = {k: b[k] for k in fields if k in b}
+    return out
+
+
+def load_benchmark_map(
+    path: str,
+    name_filter: Optional[re.Pattern] = None,
+    metric_preference: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Load a Google Benchmark JSON and index its entries by name.
+
+    Entries not matching name_filter are dropped during extraction, so
+    they never allocate map slots. Very large files are stream-parsed
+    when ijson is available; smaller files go through the whole-file
+    parser, which is faster for them.
+    """
+    if ijson is not None and os.path.getsize(path) >= STREAM_SIZE_THRESHOLD:
+        return _stream_extract(path, name_filter, metric_preference)
+    return extract_benchmarks(load_json(path), name_filter)
 
-    return {n: b for b in arr if (n := _name(b))}
+
+_DEFAULT_METRIC_CANDIDATES = (
+    "real_time",
+    "cpu_time",
+    "bytes_per_second",
+    "items_per_second",
+)
 
 
 def choose_metric_for_benchmark(
     bench_obj: Dict[str, Any], prefer: Optional[str] = None
 ) -> Tuple[str, Optional[str], float]:
+    # Fast path: an explicit preference that the entry actually carries
+    # skips the candidate-list construction and scan entirely.
+    if prefer is not None:
+        v = bench_obj.get(prefer)
+        if v is not None:
+            return prefer, bench_obj.get("time_unit"), float(v)
     time_unit = bench_obj.get("time_unit")
-    candidates = ([prefer] if prefer else []) + [
-        "real_time",
-        "cpu_time",
-        "bytes_per_second",
-        "items_per_second",
-    ]
+    candidates = (prefer,) + _DEFAULT_METRIC_CANDIDATES if prefer else _DEFAULT_METRIC_CANDIDATES
     for key in candidates:
-        if key and key in bench_obj:
-            return key, time_unit, float(bench_obj[key])
+        v = bench_obj.get(key)
+        if v is not None:
+            return key, time_unit, float(v)
     pm = bench_obj.get("primary_metric") or bench_obj.get("primary")
     if isinstance(pm, dict):
         for key in ("value", "real_time", "cpu_time"):
@@ -109,8 +247,7 @@ def classify_direction_and_severity(
     """
     if pct is None:
         return "unknown", "none"
-    sign = -1 if metric_field in THROUGHPUT_METRICS else 1
-    signed_pct = sign * pct
+    signed_pct = _SIGN.get(metric_field, 1) * pct
     if signed_pct > thresholds["minor_pct"]:
         return "regression", classify_severity(signed_pct, thresholds)
     if signed_pct < -thresholds["minor_pct"]:
@@ -118,97 +255,251 @@ def classify_direction_and_severity(
     return "unchanged", "none"
 
 
+_SEVERITY_LEVELS = ("none", "minor", "moderate", "major")
+
+if numba is not None and np is not None:
+
+    @numba.njit(cache=True)
+    def _pct_severity_kernel(ref, cur, sign, minor, moderate, major):  # pragma: no cover
+        """JIT-compiled pct/severity kernel (pure float64 math, no objects)."""
+        n = ref.shape[0]
+        pct = np.empty(n, np.float64)
+        signed = np.empty(n, np.float64)
+        sev_idx = np.empty(n, np.int64)
+        for i in range(n):
+            r = ref[i]
+            p = (cur[i] - r) / abs(r) * 100.0 if r != 0.0 else np.nan
+            pct[i] = p
+            s = sign[i] * p
+            signed[i] = s
+            if s >= major:
+                sev_idx[i] = 3
+            elif s >= moderate:
+                sev_idx[i] = 2
+            elif s >= minor:
+                sev_idx[i] = 1
+            else:
+                sev_idx[i] = 0
+        return pct, signed, sev_idx
+
+else:
+    _pct_severity_kernel = None
+
+
+def _compare_values_numpy(
+    metric_fields: List[str],
+    ref_vals: List[float],
+    cur_vals: List[float],
+    thresholds: Dict[str, float],
+) -> List[Tuple[Optional[float], str, str, float, float]]:
+    """Batch-compute (pct, direction, severity, reg_mag, imp_mag) rows with NumPy.
+
+    One vectorized pass replaces thousands of per-benchmark bytecode
+    dispatches; only the final row materialization stays in Python.
+    """
+    ref = np.asarray(ref_vals, dtype=np.float64)
+    cur = np.asarray(cur_vals, dtype=np.float64)
+    sign = np.asarray([_SIGN.get(m, 1) for m in metric_fields], dtype=np.float64)
+    minor = thresholds["minor_pct"]
+    if _pct_severity_kernel is not None:
+        pct, signed, sev_idx = _pct_severity_kernel(
+            ref, cur, sign, minor, thresholds["moderate_pct"], thresholds["major_pct"]
+        )
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(ref != 0, (cur - ref) / np.abs(ref) * 100.0, np.nan)
+        signed = sign * pct
+        sev_idx = np.digitize(
+            signed, (minor, thresholds["moderate_pct"], thresholds["major_pct"])
+        )
+
+    rows: List[Tuple[Optional[float], str, str, float, float]] = []
+    for p, s, idx in zip(pct.tolist(), signed.tolist(), sev_idx.tolist()):
+        if math.isnan(p):
+            rows.append((None, "unknown", "none", 0.0, 0.0))
+        elif s > minor:
+            rows.append((p, "regression", _SEVERITY_LEVELS[idx], s, 0.0))
+        elif s < -minor:
+            rows.append((p, "improvement", "none", 0.0, -s))
+        else:
+            rows.append((p, "unchanged", "none", 0.0, 0.0))
+    return rows
+
+
+def _compare_values_python(
+    metric_fields: List[str],
+    ref_vals: List[float],
+    cur_vals: List[float],
+    thresholds: Dict[str, float],
+) -> List[Tuple[Optional[float], str, str, float, float]]:
+    """Scalar fallback for _compare_values_numpy when NumPy is absent."""
+    minor = thresholds["minor_pct"]
+    rows: List[Tuple[Optional[float], str, str, float, float]] = []
+    for metric_field, ref_val, cur_val in zip(metric_fields, ref_vals, cur_vals):
+        if ref_val == 0:
+            rows.append((None, "unknown", "none", 0.0, 0.0))
+            continue
+        pct = (cur_val - ref_val) / abs(ref_val) * 100.0
+        signed = _SIGN.get(metric_field, 1) * pct
+        if signed > minor:
+            rows.append((pct, "regression", classify_severity(signed, thresholds), signed, 0.0))
+        elif signed < -minor:
+            rows.append((pct, "improvement", "none", 0.0, -signed))
+        else:
+            rows.append((pct, "unchanged", "none", 0.0, 0.0))
+    return rows
+
+
 def compare_maps(
     ref_map: Dict[str, Dict[str, Any]],
     cur_map: Dict[str, Dict[str, Any]],
     metric_preference: Optional[str],
     thresholds: Dict[str, float],
 ) -> List[Comparison]:
-    out: List[Comparison] = []
-    names = sorted(set(ref_map.keys()) & set(cur_map.keys()))
+    # (sort_key, Comparison) pairs; the precomputed key keeps the final sort
+    # free of per-element lambda calls. Regressions first, worst pct first.
+    aux: List[Tuple[Tuple[bool, float], Comparison]] = []
+    # Probe the larger map with the smaller one's keys instead of building
+    # two throwaway sets just to intersect them.
+    if len(ref_map) <= len(cur_map):
+        common = [n for n in ref_map if n in cur_map]
+    else:
+        common = [n for n in cur_map if n in ref_map]
+    names = sorted(common)
+
+    paired_names: List[str] = []
+    metric_fields: List[str] = []
+    time_units: List[Optional[str]] = []
+    ref_vals: List[float] = []
+    cur_vals: List[float] = []
+    # The resolved metric is invariant across entries of the same run, so
+    # once detected it becomes the preference and later entries hit the
+    # fast path in choose_metric_for_benchmark.
+    prefer = metric_preference
     for name in names:
-        ref = ref_map[name]
-        cur = cur_map[name]
         try:
             metric_field_ref, time_unit_ref, ref_val = choose_metric_for_benchmark(
-                ref, metric_preference
+                ref_map[name], prefer
             )
             _metric_field_cur, time_unit_cur, cur_val = choose_metric_for_benchmark(
-                cur, metric_preference
+                cur_map[name], prefer
             )
+            if prefer is None:
+                prefer = metric_field_ref
         except ValueError as e:
-            out.append(
-                Comparison(
-                    name,
-                    metric_preference or "unknown",
-                    math.nan,
-                    math.nan,
-                    None,
-                    "unknown",
-                    "none",
-                    None,
-                    f"metric error: {e}",
+            aux.append(
+                (
+                    (True, 0.0),
+                    Comparison(
+                        name,
+                        metric_preference or "unknown",
+                        math.nan,
+                        math.nan,
+                        None,
+                        "unknown",
+                        "none",
+                        None,
+                        f"metric error: {e}",
+                        kernel_key=_split_kernel_and_size(name)[0],
+                    ),
                 )
             )
             continue
-
-        metric_field = metric_field_ref
-
-        if ref_val == 0:
-            pct = None
-            notes = "ref value is zero (cannot compute pct change)"
-        else:
-            pct = (cur_val - ref_val) / abs(ref_val) * 100.0
+        paired_names.append(name)
+        metric_fields.append(metric_field_ref)
+        time_units.append(time_unit_ref or time_unit_cur)
+        ref_vals.append(ref_val)
+        cur_vals.append(cur_val)
+
+    compare_values = _compare_values_numpy if np is not None else _compare_values_python
+    rows = compare_values(metric_fields, ref_vals, cur_vals, thresholds)
+
+    # Row materialization is the remaining per-benchmark cost: construct
+    # positionally (no kwargs processing) and hoist the bound append.
+    zero_note = "ref value is zero (cannot compute pct change)"
+    aux_append = aux.append
+    for name, metric_field, time_unit, ref_val, cur_val, (
+        pct,
+        direction,
+        severity,
+        reg_mag,
+        imp_mag,
+    ) in zip(paired_names, metric_fields, time_units, ref_vals, cur_vals, rows):
+        is_throughput = metric_field in THROUGHPUT_METRICS
+        if pct is not None:
+            # Stored at full precision; display formatting rounds at the
+            # rendering step and CI JSON benefits from the exact values.
+            pct_change = pct
+            relative_change = pct / 100.0
             notes = None
-
-        direction, severity = classify_direction_and_severity(metric_field, pct, thresholds)
-
-        out.append(
-            Comparison(
-                name=name,
-                metric=metric_field,
-                ref_value=ref_val,
-                cur_value=cur_val,
-                pct_change=round(pct, 4) if pct is not None else None,
-                relative_change=round(pct / 100.0, 6) if pct is not None else None,
-                direction=direction,
-                severity=severity,
-                time_unit=time_unit_ref or time_unit_cur,
-                notes=notes,
+        else:
+            pct_change = relative_change = None
+            notes = zero_note
+        aux_append(
+            (
+                (direction != "regression", -pct_change if pct_change else 0.0),
+                Comparison(
+                    name,
+                    metric_field,
+                    ref_val,
+                    cur_val,
+                    pct_change,
+                    direction,
+                    severity,
+                    time_unit,
+                    notes,
+                    relative_change,
+                    is_throughput,
+                    reg_mag,
+                    imp_mag,
+                    _split_kernel_and_size(name)[0],
+                ),
             )
         )
-    return sorted(
-        out,
-        key=lambda c: (c.direction != "regression", -(c.pct_change or 0) if c.pct_change else 0),
-    )
+    aux.sort(key=operator.itemgetter(0))
+    return [c for _, c in aux]
 
 
+@functools.lru_cache(maxsize=None)
 def _split_kernel_and_size(bench_name: str) -> Tuple[str, Optional[int]]:
-    if "/" in bench_name:
-        base, maybe_size = bench_name.rsplit("/", 1)
-        if maybe_size.isdigit():
-            return base, int(maybe_size)
+    base, sep, tail = bench_name.rpartition("/")
+    if sep and tail.isdigit():
+        return base, int(tail)
+    if sep:
         return base, None
     return bench_name, None
 
 
 def aggregate_series(
     comparisons: List[Comparison], *, thresholds: Optional[Dict[str, float]] = None
-) -> List[Dict[str, Any]]:
+) -> List[Aggregate]:
     if thresholds is None:
         thresholds = DEFAULT_THRESHOLDS
-    groups: Dict[str, List[Comparison]] = {}
+    # One pass accumulating [sum, min, max, n_rels, n_entries] per kernel,
+    # avoiding the per-group intermediate list and a second sweep. The
+    # kernel key is read straight off the Comparison (split once at
+    # construction in compare_maps).
+    groups: DefaultDict[str, List[Any]] = defaultdict(
+        lambda: [0.0, math.inf, -math.inf, 0, 0]
+    )
     for c in comparisons:
-        key, _ = _split_kernel_and_size(c.name)
-        groups.setdefault(key, []).append(c)
-
-    aggregates: List[Dict[str, Any]] = []
-    for key, entries in groups.items():
-        rels = [e.relative_change for e in entries if e.relative_change is not None]
-        if not rels:
+        g = groups[c.kernel_key]
+        g[4] += 1
+        rc = c.relative_change
+        if rc is None:
+            continue
+        g[0] += rc
+        if rc < g[1]:
+            g[1] = rc
+        if rc > g[2]:
+            g[2] = rc
+        g[3] += 1
+
+    aggregates: List[Aggregate] = []
+    for key, (total, min_rc, max_rc, n_rels, n_entries) in groups.items():
+        if n_rels == 0:
             continue
-        mean_rc = statistics.fmean(rels)
-        min_rc, max_rc = min(rels), max(rels)
+        mean_rc = total / n_rels
         mag_pct = abs(mean_rc) * 100.0
         if mag_pct < thresholds["minor_pct"]:
             aggregated_direction = "unchanged"
@@ -218,29 +509,24 @@ def aggregate_series(
             classify_severity(mag_pct, thresholds) if aggregated_direction == "regression" else "none"
         )
         aggregates.append(
-            {
-                "kernel": key,
-                "count": len(entries),
-                "mean_relative_change": round(mean_rc, 6),
-                "min_relative_change": round(min_rc, 6),
-                "max_relative_change": round(max_rc, 6),
-                "aggregated_direction": aggregated_direction,
-                "aggregated_severity": agg_sev,
-            }
+            Aggregate(
+                kernel=key,
+                count=n_entries,
+                mean_relative_change=round(mean_rc, 6),
+                min_relative_change=round(min_rc, 6),
+                max_relative_change=round(max_rc, 6),
+                aggregated_direction=aggregated_direction,
+                aggregated_severity=agg_sev,
+            )
         )
-    return sorted(aggregates, key=lambda x: x["mean_relative_change"], reverse=True)
-
-
-def _regression_magnitude_pct(c: Comparison) -> float:
-    if c.direction != "regression" or c.pct_change is None:
-        return 0.0
-    return max(0.0, -c.pct_change) if c.metric in THROUGHPUT_METRICS else max(0.0, c.pct_change)
+    aggregates.sort(key=operator.attrgetter("mean_relative_change"), reverse=True)
+    return aggregates
 
 
-def _improvement_magnitude_pct(c: Comparison) -> float:
-    if c.direction != "improvement" or c.pct_change is None:
-        return 0.0
-    return max(0.0, c.pct_change) if c.metric in THROUGHPUT_METRICS else max(0.0, -c.pct_change)
+# Sort/reduction keys over the precomputed magnitudes; attrgetter keeps
+# the per-item call in C instead of a Python frame.
+_regression_magnitude_pct = operator.attrgetter("regression_magnitude_pct")
+_improvement_magnitude_pct = operator.attrgetter("improvement_magnitude_pct")
 
 
 def evaluate_ci_gate(
@@ -252,26 +538,19 @@ def evaluate_ci_gate(
     threshold_rank = severity_rank.get(fail_on_severity, 3)
 
     regressions = [c for c in comparisons if c.direction == "regression"]
-    worst, worst_mag = None, 0.0
-    reasons: List[str] = []
-    for c in regressions:
-        mag = _regression_magnitude_pct(c)
-        if mag >= worst_mag:
-            worst_mag, worst = mag, c
-        if severity_rank.get(c.severity, 0) >= threshold_rank:
-            reasons.append(
-                f"severity>={fail_on_severity}: {c.name} ({c.metric}) {c.pct_change:+.2f}%"
-            )
+    worst = max(regressions, key=_regression_magnitude_pct, default=None)
+    reasons: List[str] = [
+        f"severity>={fail_on_severity}: {c.name} ({c.metric}) {c.pct_change:+.2f}%"
+        for c in regressions
+        if severity_rank.get(c.severity, 0) >= threshold_rank
+    ]
 
-    if max_top_reg_pct is not None and worst_mag >= max_top_reg_pct:
-        if worst is not None:
+    if max_top_reg_pct is not None and worst is not None:
+        worst_mag = _regression_magnitude_pct(worst)
+        if worst_mag >= max_top_reg_pct:
             reasons.append(
                 f"top_regression {worst.name} ({worst.metric}) magnitude {worst_mag:.2f}% >= {max_top_reg_pct:.2f}%"
             )
-        else:
-            reasons.append(
-                f"top_regression magnitude {worst_mag:.2f}% >= {max_top_reg_pct:.2f}%"
-            )
 
     return {
         "failed": len(reasons) > 0,
@@ -285,8 +564,10 @@ __all__ = [
     "THROUGHPUT_METRICS",
     "BenchEntry",
     "Comparison",
+    "Aggregate",
     "load_json",
     "extract_benchmarks",
+    "load_benchmark_map",
     "choose_metric_for_benchmark",
     "classify_direction_and_severity",
     "compare_maps",
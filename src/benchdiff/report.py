@@ -6,6 +6,9 @@ Presentation and printing helpers for BenchDiff terminal output.
 
 from __future__ import annotations
 
+import heapq
+import sys
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from .color_utils import (
@@ -18,6 +21,7 @@ from .color_utils import (
     classify_severity,
 )
 from .compare import (
+    Aggregate,
     Comparison,
     aggregate_series,
     _regression_magnitude_pct,
@@ -41,22 +45,24 @@ AGGREGATED_TABLE_HEADER = (
     f"{'direction':>{DIR_COL_WIDTH}} | {'severity':>8}"
 )
 
+# Row templates with the column widths baked in as literals, so the
+# format specs are parsed once at import instead of once per row.
+_AGG_ROW_FMT = f"{{:{KERNEL_COL_WIDTH}}} | {{:>3}} | {{}} | {{}} | {{}} | {{}} | {{}}"
+_TOP_ROW_FMT = f"{{:{NAME_COL_WIDTH}}} | {{:{METRIC_COL_WIDTH}}} | {{}} | {{}} | {{}}"
 
-def _print_aggregated_header() -> None:
-    header = AGGREGATED_TABLE_HEADER
-    print(header)
-    print("-" * len(header))
+
+def _emit(lines: List[str]) -> None:
+    """Write buffered lines in one stdout call instead of one per row."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def _format_aggregated_cells(
-    a: Dict[str, Any], *, thresholds: Dict[str, float], color_enabled: bool
+    a: Aggregate, *, thresholds: Dict[str, float], color_enabled: bool
 ) -> Tuple[str, str, str, str, str]:
-    if a["aggregated_direction"] == "regression":
-        sev_for_label = (
-            a["aggregated_severity"] if isinstance(a["aggregated_severity"], str) else "none"
-        )
-    elif a["aggregated_direction"] == "improvement":
-        mag_pct_disp = abs(a.get("mean_relative_change") or 0.0) * 100.0
+    if a.aggregated_direction == "regression":
+        sev_for_label = a.aggregated_severity
+    elif a.aggregated_direction == "improvement":
+        mag_pct_disp = abs(a.mean_relative_change or 0.0) * 100.0
         sev_for_label = (
             classify_severity(mag_pct_disp, thresholds)
             if mag_pct_disp >= thresholds["minor_pct"]
@@ -66,7 +72,7 @@ def _format_aggregated_cells(
         sev_for_label = "none"
 
     dir_col = colorize_direction(
-        a["aggregated_direction"],
+        a.aggregated_direction,
         sev_for_label,
         enabled=color_enabled,
     )
@@ -74,23 +80,23 @@ def _format_aggregated_cells(
 
     mean_cell = pad_ansi(
         colorize_rel_change(
-            a["mean_relative_change"], thresholds=thresholds, enabled=color_enabled
+            a.mean_relative_change, thresholds=thresholds, enabled=color_enabled
         ),
         8,
         align="right",
     )
 
-    if a["count"] > 1:
+    if a.count > 1:
         min_cell = pad_ansi(
             colorize_rel_change(
-                a["min_relative_change"], thresholds=thresholds, enabled=color_enabled
+                a.min_relative_change, thresholds=thresholds, enabled=color_enabled
             ),
             8,
             align="right",
         )
         max_cell = pad_ansi(
             colorize_rel_change(
-                a["max_relative_change"], thresholds=thresholds, enabled=color_enabled
+                a.max_relative_change, thresholds=thresholds, enabled=color_enabled
             ),
             8,
             align="right",
@@ -102,8 +108,8 @@ def _format_aggregated_cells(
 
     sev_cell = pad_ansi(
         colorize_severity_label(
-            a["aggregated_severity"] if isinstance(a.get("aggregated_severity"), str) else "none",
-            a["aggregated_direction"],
+            a.aggregated_severity,
+            a.aggregated_direction,
             enabled=color_enabled,
         ),
         8,
@@ -149,14 +155,18 @@ def print_quick_summary(
     value_width = 8
     table_rule = "-" * (label_width + 3 + value_width)
 
-    def _row(label: str, value: str) -> None:
-        print(f"{label.ljust(label_width)} | {pad_ansi(value, value_width, align='right')}")
-
-    print(table_rule)
-    _row("Total compared", total_val)
-    _row("Regressions", regs_val)
-    _row("Improvements", imps_val)
-    print(table_rule)
+    def _row(label: str, value: str) -> str:
+        return f"{label.ljust(label_width)} | {pad_ansi(value, value_width, align='right')}"
+
+    _emit(
+        [
+            table_rule,
+            _row("Total compared", total_val),
+            _row("Regressions", regs_val),
+            _row("Improvements", imps_val),
+            table_rule,
+        ]
+    )
 
 
 def _print_aggregated_table(
@@ -170,14 +180,17 @@ def _print_aggregated_table(
     """Print an aggregated per-kernel table with the given limit and title."""
     aggs = aggregate_series(comparisons, thresholds=thresholds)
     _print_section(title, color_enabled=color_enabled)
-    _print_aggregated_header()
+    buf = [AGGREGATED_TABLE_HEADER, "-" * len(AGGREGATED_TABLE_HEADER)]
     for a in aggs[:limit]:
         mean_cell, min_cell, max_cell, dir_cell, sev_cell = _format_aggregated_cells(
             a, thresholds=thresholds, color_enabled=color_enabled
         )
-        print(
-            f"{a['kernel']:{KERNEL_COL_WIDTH}} | {a['count']:>3} | {mean_cell} | {min_cell} | {max_cell} | {dir_cell} | {sev_cell}"
+        buf.append(
+            _AGG_ROW_FMT.format(
+                a.kernel, a.count, mean_cell, min_cell, max_cell, dir_cell, sev_cell
+            )
         )
+    _emit(buf)
 
 
 def print_aggregated_top(
@@ -204,6 +217,57 @@ def print_aggregated_full(
     )
 
 
+@lru_cache(maxsize=4096)
+def _render_top_row(
+    name: str,
+    metric: str,
+    rel: Optional[float],
+    direction: str,
+    severity: str,
+    thresholds_key: Tuple[float, float, float],
+    color_enabled: bool,
+) -> str:
+    """Render one Top-entries row, fused and cached.
+
+    The rel-change cell, direction color and severity label all derive
+    from the same handful of inputs, so identical rows (including reruns
+    of a section) come straight from the cache.
+    """
+    minor, moderate, major = thresholds_key
+    thresholds = {"minor_pct": minor, "moderate_pct": moderate, "major_pct": major}
+    rel_cell = pad_ansi(
+        colorize_rel_change(rel, thresholds=thresholds, enabled=color_enabled),
+        8,
+        align="right",
+    )
+    if direction == "regression":
+        # Regression rows carry their classified severity already; the
+        # displayed magnitude is the same signed change it was rated on.
+        sev_for_dir = severity
+    else:
+        mag_pct_disp = abs(rel or 0.0) * 100.0
+        sev_for_dir = (
+            classify_severity(mag_pct_disp, thresholds) if mag_pct_disp >= minor else "minor"
+        )
+    dir_cell = pad_ansi(
+        colorize_direction(direction, sev_for_dir, enabled=color_enabled),
+        DIR_COL_WIDTH,
+        align="right",
+    )
+    sev_cell = pad_ansi(
+        colorize_severity_label(severity, direction, enabled=color_enabled),
+        8,
+        align="right",
+    )
+    return _TOP_ROW_FMT.format(
+        fit_text(name, NAME_COL_WIDTH),
+        fit_text(metric, METRIC_COL_WIDTH),
+        rel_cell,
+        dir_cell,
+        sev_cell,
+    )
+
+
 def print_top_entries(
     comparisons: List[Comparison],
     *,
@@ -217,72 +281,51 @@ def print_top_entries(
         f"{'name':{NAME_COL_WIDTH}} | {'metric':{METRIC_COL_WIDTH}} | {'rel_chg':>8} | "
         f"{'direction':>{DIR_COL_WIDTH}} | {'severity':>8}"
     )
-    print(header)
-    print("-" * len(header))
+    buf = [header, "-" * len(header)]
 
     regs = [c for c in comparisons if c.direction == "regression"]
     imps = [c for c in comparisons if c.direction == "improvement"]
 
-    regs_sorted = sorted(regs, key=_regression_magnitude_pct, reverse=True)
-    reg_iter = regs_sorted if show_all else regs_sorted[:TOP_REG_COUNT]
+    thresholds_key = (
+        thresholds["minor_pct"],
+        thresholds["moderate_pct"],
+        thresholds["major_pct"],
+    )
+
+    # Top-K selection: a bounded heap is O(N log K) instead of sorting
+    # everything just to slice the first few rows.
+    if show_all:
+        reg_iter = sorted(regs, key=_regression_magnitude_pct, reverse=True)
+    else:
+        reg_iter = heapq.nlargest(TOP_REG_COUNT, regs, key=_regression_magnitude_pct)
     for c in reg_iter:
-        rel_cell = pad_ansi(
-            colorize_rel_change(c.relative_change, thresholds=thresholds, enabled=color_enabled),
-            8,
-            align="right",
-        )
-        mag_pct_disp = abs(c.relative_change or 0.0) * 100.0
-        sev_for_dir = (
-            classify_severity(mag_pct_disp, thresholds)
-            if mag_pct_disp >= thresholds["minor_pct"]
-            else "minor"
-        )
-        dir_colored = colorize_direction(c.direction, sev_for_dir, enabled=color_enabled)
-        dir_cell = pad_ansi(dir_colored, DIR_COL_WIDTH, align="right")
-        name_cell = fit_text(c.name, NAME_COL_WIDTH)
-        metric_cell = fit_text(c.metric, METRIC_COL_WIDTH)
-        sev_cell = pad_ansi(
-            colorize_severity_label(c.severity, c.direction, enabled=color_enabled),
-            8,
-            align="right",
-        )
-        print(
-            f"{name_cell:{NAME_COL_WIDTH}} | {metric_cell:{METRIC_COL_WIDTH}} | {rel_cell} | {dir_cell} | {sev_cell}"
+        buf.append(
+            _render_top_row(
+                c.name, c.metric, c.relative_change, c.direction, c.severity,
+                thresholds_key, color_enabled,
+            )
         )
 
-    print("-" * len(header))
+    buf.append("-" * len(header))
 
     n_imp = top_imp if top_imp is not None else TOP_IMP_COUNT
-    imp_base = sorted(imps, key=_improvement_magnitude_pct, reverse=True)
-    imp_selected = imp_base if show_all else imp_base[:n_imp]
+    if show_all:
+        imp_selected = sorted(imps, key=_improvement_magnitude_pct, reverse=True)
+    else:
+        imp_selected = heapq.nlargest(n_imp, imps, key=_improvement_magnitude_pct)
     imp_selected = sorted(
         imp_selected, key=lambda c: (c.relative_change if c.relative_change is not None else 0.0)
     )
     for c in imp_selected:
-        rel_cell = pad_ansi(
-            colorize_rel_change(c.relative_change, thresholds=thresholds, enabled=color_enabled),
-            8,
-            align="right",
-        )
-        mag_pct_disp = abs(c.relative_change or 0.0) * 100.0
-        sev_for_dir = (
-            classify_severity(mag_pct_disp, thresholds)
-            if mag_pct_disp >= thresholds["minor_pct"]
-            else "minor"
-        )
-        dir_colored = colorize_direction(c.direction, sev_for_dir, enabled=color_enabled)
-        dir_cell = pad_ansi(dir_colored, DIR_COL_WIDTH, align="right")
-        name_cell = fit_text(c.name, NAME_COL_WIDTH)
-        metric_cell = fit_text(c.metric, METRIC_COL_WIDTH)
-        sev_cell = pad_ansi(
-            colorize_severity_label(c.severity, c.direction, enabled=color_enabled),
-            8,
-            align="right",
-        )
-        print(
-            f"{name_cell:{NAME_COL_WIDTH}} | {metric_cell:{METRIC_COL_WIDTH}} | {rel_cell} | {dir_cell} | {sev_cell}"
+        buf.append(
+            _render_top_row(
+                c.name, c.metric, c.relative_change, c.direction, c.severity,
+                thresholds_key, color_enabled,
+            )
         )
 
+    _emit(buf)
+
 
 __all__ = [
     "NAME_COL_WIDTH",